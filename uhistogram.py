@@ -24,14 +24,37 @@ try:
 except ImportError:
     pass
 
+import array
+import math
 from ulab import numpy as np
-from bitmaptools import draw_line
+from bitmaptools import fill_region
 import displayio
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/jposada202020/CircuitPython_uhistogram.git"
 
 
+def _bin_counts(arr, bin_count, start, distance):
+    """
+    Counts the samples falling in each of ``bin_count`` bins of width ``distance``,
+    the first one starting at ``start``. The bin index of every sample is found with
+    a single rescaling of ``arr``, so the counting runs in ulab and not in the
+    interpreter. Samples beyond the last bin edge are counted in the last bin.
+    Counting stops as soon as every sample has been placed.
+    """
+    index = np.clip(np.floor((arr - start) / distance), 0, bin_count - 1)
+    bins = array.array("H", bytes(2 * bin_count))
+    remaining = len(arr)
+    for i in range(bin_count - 1):
+        if not remaining:
+            return bins
+        count = int(np.sum(index == i))
+        bins[i] = count
+        remaining -= count
+    bins[bin_count - 1] = remaining
+    return bins
+
+
 class Histogram(displayio.TileGrid):
     """A Histogram TileGrid. The origin is set using ``x`` and ``y``.
 
@@ -42,7 +65,7 @@ class Histogram(displayio.TileGrid):
     :param int width: requested width, in pixels. Defaults to 100 pixels.
     :param int height: requested height, in pixels. Defaults to 100 pixels.
 
-    :param int line_color: background color to use defaults to white (0xFFFFFF)
+    :param int line_color: color of the bins, defaults to blue (0x0000FF)
 
     **Quickstart: Importing and using uhistogram**
 
@@ -81,6 +104,9 @@ class Histogram(displayio.TileGrid):
 
         - **color**: ``line_color``
 
+    The number of samples in each bin is available as integers in ``bin_counts``,
+    and as a ulab array in ``bin_data``.
+
 
     .. figure:: histogram.png
        :scale: 100 %
@@ -100,33 +126,24 @@ class Histogram(displayio.TileGrid):
         y: int,
         height: int = 100,
         width: int = 100,
-        line_color: int = 0xFFFFFF,
+        line_color: int = 0x0000FF,
     ) -> None:
-        self._data_raw = data
-        self.data = np.array(data)
-        self._width = width
+        self._height = height
 
-        self._color_palette = displayio.Palette(4)
-        self._color_palette[2] = line_color
-        self._color_palette[3] = 0x0000FF
-        self._bitmap = displayio.Bitmap(width + 1, height + 1, 3)
+        self._color_palette = displayio.Palette(2)
+        self._color_palette[0] = 0x000000
+        self._color_palette[1] = line_color
+        self._bitmap = displayio.Bitmap(width, height + 1, 2)
 
         self._yorigin = height
         self._xstart = 0
 
-        self.bin_data = self.get_numberbins(data, rule=0)
-
-        self._numbins = len(self.bin_data)
-        self._binmaxqty = int(np.max(self.bin_data))
-        self._graphx = self._width // self._numbins
-        self._graphy = height // self._binmaxqty
-
-        maximum = self._binmaxqty
-        self._new_min = int(self.normalize(0, maximum, maximum, 0, 0))
-        self._new_max = int(self.normalize(0, maximum, maximum, 0, maximum))
+        self.set_data(data)
 
         super().__init__(self._bitmap, pixel_shader=self._color_palette, x=x, y=y)
 
+        self.draw()
+
     @staticmethod
     def normalize(oldrangemin, oldrangemax, newrangemin, newrangemax, value):
         """
@@ -152,17 +169,17 @@ class Histogram(displayio.TileGrid):
         :return: None
         """
 
-        distribution = {
-            i: self._data_raw.count(i) / len(self._data_raw)
-            for i in set(self._data_raw)
-        }
-        distribution2 = {i: self._data_raw.count(i) for i in set(self._data_raw)}
+        frequency = {}
+        for value in self._data_raw:
+            frequency[value] = frequency.get(value, 0) + 1
+        total = len(self._data_raw)
+        distribution = {i: count / total for i, count in frequency.items()}
 
         print("Distribution in % of your data")
         print(distribution)
         print("-" * 40)
         print("Frequency")
-        print(distribution2)
+        print(frequency)
         print("-" * 40)
         print("Recommended bins number for your data")
         print(len(self.bin_data))
@@ -170,29 +187,67 @@ class Histogram(displayio.TileGrid):
         print("Bins distribution")
         print(self.bin_data)
 
-    def draw(self):
+    @property
+    def data(self):
+        """
+        The histogram source data as a ulab array. The array is built on every access,
+        so it is not kept in memory. Setting it replaces the data, as `set_data` does.
+        """
+        return np.array(self._data_raw)
+
+    @data.setter
+    def data(self, data: Union[list, Tuple]) -> None:
+        self.set_data(data)
+
+    def set_data(self, data: Union[list, Tuple]) -> None:
         """
-        This function draws the histogram
+        This function replaces the histogram data and recalculates the bins.
+        Call `draw` afterwards to show the new bins
 
+        :param (list, tuple) data: source data to calculate the histogram
+        :return: None
         """
+        self._data_raw = data
 
-        for i in range(self._numbins):
-            self._draw_rectangle(
-                self._xstart + (i * self._graphx),
-                self._yorigin,
-                self._graphx,
-                self._graphy * int(self.bin_data[i]),
-                3,
-            )
+        self.bin_counts = self._get_counts(data, rule=0)
+        self.bin_data = np.array(self.bin_counts)
+
+        self._numbins = len(self.bin_counts)
+        self._binmaxqty = max(self.bin_counts) or 1
+        # Bars are laid out over the bitmap columns, so together they cover all of them
+        width = self._bitmap.width
+        self._graphx = max(1, width // self._numbins)
+        extra = max(0, width - self._graphx * self._numbins)
+        self._bar_widths = [
+            self._graphx + (1 if i < extra else 0) for i in range(self._numbins)
+        ]
+        self._bar_x = []
+        x = self._xstart
+        for bar_width in self._bar_widths:
+            self._bar_x.append(x)
+            x += bar_width
+        self._bar_h = [
+            count * self._height // self._binmaxqty for count in self.bin_counts
+        ]
+
+        self._dirty = True
 
-    def _draw_rectangle(self, x, y, width, height, color):
+    def draw(self):
         """
-        Helper function to draw bins rectangles
+        This function draws the histogram. The histogram is drawn when created,
+        calling it again only redraws it if the data changed with `set_data`
+
         """
-        draw_line(self._bitmap, x, y, x + width, y, color)
-        draw_line(self._bitmap, x, y, x, y - height, color)
-        draw_line(self._bitmap, x + width, y, x + width, y - height, color)
-        draw_line(self._bitmap, x + width, y - height, x, y - height, color)
+        if not self._dirty:
+            return
+
+        bitmap = self._bitmap
+        bitmap.fill(0)
+        yorigin = self._yorigin
+        for x, bar_width, bar_height in zip(self._bar_x, self._bar_widths, self._bar_h):
+            fill_region(bitmap, x, yorigin - bar_height, x + bar_width, yorigin + 1, 1)
+
+        self._dirty = False
 
     @staticmethod
     def get_numberbins(data, rule=0):
@@ -210,26 +265,35 @@ class Histogram(displayio.TileGrid):
         :return: bin calculated data
 
         """
+        return np.array(Histogram._get_counts(data, rule))
+
+    @staticmethod
+    def _get_counts(data, rule=0):
+        """
+        Helper function for `get_numberbins` returning the bins data as an
+        unsigned short array
+        """
+        n = len(data)
+        arr = np.array(data)
+        dmin = float(np.min(arr))
+        dmax = float(np.max(arr))
+        rng = abs(dmax - dmin)
+        if rng == 0:  # All the samples share the same value
+            return array.array("H", (n,))
+
         if rule == 2:  # Normal’s rule
-            if len(data) > 30:
+            if n > 30:
                 rule = 0
             else:
                 rule = 1
-        if rule == 0:  # Sturge’s rule
-            bin_count = int(np.ceil(np.log2(len(data))) + 1)
+        if rule == 0:  # Sturge’s rule, ceil(log2(n)) + 1 in integer math
+            bin_count = 1
+            size = n - 1
+            while size:
+                bin_count += 1
+                size >>= 1
         if rule == 1:  # Square Root Choice’s rule
-            bin_count = int(
-                np.ceil(abs(np.max(data) - np.min(data)) / np.sqrt(len(data)))
-            )
-
-        start = min(data)
-        distance = int(np.ceil(abs(max(data) - min(data)) / bin_count))
-        end = min(data) + distance
-        bins = np.zeros(bin_count)
-        for i in range(bin_count):
-            for item in data:
-                if start <= item < end:
-                    bins[i] = bins[i] + 1
-            start = end
-            end = end + distance
-        return bins
+            bin_count = int(math.ceil(rng / math.sqrt(n)))
+
+        distance = max(1, int(math.ceil(rng / bin_count)))
+        return _bin_counts(arr, bin_count, dmin, distance)